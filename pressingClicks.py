@@ -16,17 +16,45 @@ Features:
 - Macro timeline with live recording feed
 """
 
+import os
 import sys
 import json
+import math
 import threading
 import ctypes
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from time import sleep, time
-from random import uniform
+from time import sleep, perf_counter, monotonic_ns
+from random import uniform, random
 from pynput.mouse import Controller, Button, Listener as MouseListener
 from pynput.keyboard import Key, Listener as KeyboardListener
 
+# orjson / ujson are optional — they serialise large routines several times
+# faster than the stdlib; the first one found is used
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        def _dumps(obj):
+            return ujson.dumps(obj, indent=2).encode("utf-8")
+
+        _loads = ujson.loads
+    except ImportError:
+        def _dumps(obj):
+            return json.dumps(obj, indent=4).encode("utf-8")
+
+        _loads = json.loads
+
 # ==============================
 # DPI Awareness (Windows)
 # Must be called before any window creation or mouse listener starts so that
@@ -44,6 +72,206 @@ if sys.platform == "win32":
             pass
 
 
+# ==============================
+# High-Resolution Sleep (Windows)
+# time.sleep() is rounded up to the scheduler tick (~15.6 ms by default), so
+# short waits such as the per-step drag pacing overshoot badly. A waitable
+# timer created with CREATE_WAITABLE_TIMER_HIGH_RESOLUTION (Windows 10 1803+)
+# wakes within ~0.5 ms without touching the system-wide timer resolution.
+# ==============================
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    # A private loader: prototypes set on ctypes.windll's shared function
+    # objects would also apply to pynput, which declares its own.
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateWaitableTimerExW.restype = wintypes.HANDLE
+    _kernel32.CreateWaitableTimerExW.argtypes = (
+        ctypes.c_void_p, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD)
+    _kernel32.SetWaitableTimerEx.restype = wintypes.BOOL
+    _kernel32.SetWaitableTimerEx.argtypes = (
+        wintypes.HANDLE, ctypes.POINTER(wintypes.LARGE_INTEGER), wintypes.LONG,
+        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, wintypes.ULONG)
+    _kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    _kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+
+    CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+    TIMER_ALL_ACCESS = 0x1F0003
+    INFINITE = 0xFFFFFFFF
+
+    _timer_local = threading.local()
+
+    def _get_timer():
+        """Return this thread's waitable timer handle (0 if unsupported)."""
+        handle = getattr(_timer_local, "handle", None)
+        if handle is None:
+            handle = _kernel32.CreateWaitableTimerExW(
+                None, None, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION,
+                TIMER_ALL_ACCESS) or 0
+            _timer_local.handle = handle
+        return handle
+
+    SPIN_THRESHOLD = 0.001   # waits shorter than the timer's precision (s)
+
+    def precise_sleep(seconds):
+        """Block for `seconds` using a high-resolution waitable timer.
+        Sub-millisecond waits spin on perf_counter() instead, and
+        time.sleep() is used when the timer is unavailable."""
+        ticks = int(seconds * 10_000_000)     # 100 ns units
+        if ticks <= 0:
+            return
+        if seconds < SPIN_THRESHOLD:
+            deadline = perf_counter() + seconds
+            while perf_counter() < deadline:
+                pass
+            return
+        handle = _get_timer()
+        due = wintypes.LARGE_INTEGER(-ticks)  # negative = relative due time
+        if handle and _kernel32.SetWaitableTimerEx(
+                handle, ctypes.byref(due), 0, None, None, None, 0):
+            _kernel32.WaitForSingleObject(handle, INFINITE)
+        else:
+            sleep(seconds)
+
+    # Builds older than Windows 10 1803 reject the high-resolution flag. Fall
+    # back to raising the global timer resolution to 1 ms for the lifetime of
+    # the app, which also tightens time.sleep(), Event.wait() and Tk's after().
+    # Newer systems keep the per-process timer and avoid the power penalty.
+    _TIMER_PERIOD_RAISED = not _get_timer()
+    if _TIMER_PERIOD_RAISED:
+        ctypes.windll.winmm.timeBeginPeriod(1)
+else:
+    precise_sleep = sleep
+    _TIMER_PERIOD_RAISED = False
+
+
+def precise_sleep_until(deadline):
+    """Sleep until time.perf_counter() reaches `deadline`. Pacing a loop
+    against absolute deadlines keeps per-step overshoot from accumulating."""
+    remaining = deadline - perf_counter()
+    if remaining > 0:
+        precise_sleep(remaining)
+
+
+# ==============================
+# Native Mouse Input (Windows)
+# pynput moves the cursor with one SetCursorPos round-trip per call. Drags
+# instead prebuild an INPUT[] array of absolute moves and replay it with
+# SendInput, one record per tick; clicks use SendInput as well.
+# ==============================
+if sys.platform == "win32":
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = (("dx", wintypes.LONG),
+                    ("dy", wintypes.LONG),
+                    ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ctypes.c_size_t))
+
+    class _INPUT(ctypes.Structure):
+        # MOUSEINPUT is the largest member of the native INPUT union, so this
+        # layout has the same size and alignment as the real structure.
+        _fields_ = (("type", wintypes.DWORD),
+                    ("mi", _MOUSEINPUT))
+
+    INPUT_MOUSE = 0
+    MOUSEEVENTF_MOVE = 0x0001
+    MOUSEEVENTF_LEFTDOWN = 0x0002
+    MOUSEEVENTF_LEFTUP = 0x0004
+    MOUSEEVENTF_RIGHTDOWN = 0x0008
+    MOUSEEVENTF_RIGHTUP = 0x0010
+    MOUSEEVENTF_MIDDLEDOWN = 0x0020
+    MOUSEEVENTF_MIDDLEUP = 0x0040
+    MOUSEEVENTF_VIRTUALDESK = 0x4000
+    MOUSEEVENTF_ABSOLUTE = 0x8000
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)   # private, as above
+    _SendInput = _user32.SendInput
+    _SendInput.restype = wintypes.UINT
+    _SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int)
+    _INPUT_SIZE = ctypes.sizeof(_INPUT)
+
+    # Virtual desktop bounds in physical pixels (the process is DPI-aware)
+    _SCREEN_LEFT = _user32.GetSystemMetrics(76)           # SM_XVIRTUALSCREEN
+    _SCREEN_TOP = _user32.GetSystemMetrics(77)            # SM_YVIRTUALSCREEN
+    _SCREEN_W = max(1, _user32.GetSystemMetrics(78))      # SM_CXVIRTUALSCREEN
+    _SCREEN_H = max(1, _user32.GetSystemMetrics(79))      # SM_CYVIRTUALSCREEN
+
+    _MOVE_FLAGS = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+
+    def _win_set_pos(inp, x, y):
+        """Store (x, y) in `inp` as absolute virtual-desktop coordinates."""
+        # normalise to 0..65535, rounding up so the pixel maps back exactly
+        inp.mi.dx = ((x - _SCREEN_LEFT) * 65536 + _SCREEN_W - 1) // _SCREEN_W
+        inp.mi.dy = ((y - _SCREEN_TOP) * 65536 + _SCREEN_H - 1) // _SCREEN_H
+
+    def _win_move_batch(points):
+        """Build an INPUT array with one absolute cursor move per point."""
+        inputs = (_INPUT * len(points))()
+        for inp, (x, y) in zip(inputs, points):
+            inp.type = INPUT_MOUSE
+            inp.mi.dwFlags = _MOVE_FLAGS
+            _win_set_pos(inp, x, y)
+        return inputs
+
+
+# ==============================
+# Scheduling (Windows)
+# A higher thread priority keeps playback on time under background CPU load,
+# and opting out of EcoQoS stops Windows from throttling the process (and
+# ignoring its timer resolution) while the window is minimised.
+# ==============================
+if sys.platform == "win32":
+    THREAD_PRIORITY_HIGHEST = 2
+    ProcessPowerThrottling = 4
+    PROCESS_POWER_THROTTLING_CURRENT_VERSION = 1
+    PROCESS_POWER_THROTTLING_EXECUTION_SPEED = 0x1
+    PROCESS_POWER_THROTTLING_IGNORE_TIMER_RESOLUTION = 0x4
+
+    class _PROCESS_POWER_THROTTLING_STATE(ctypes.Structure):
+        _fields_ = (("Version", wintypes.ULONG),
+                    ("ControlMask", wintypes.ULONG),
+                    ("StateMask", wintypes.ULONG))
+
+    # pseudo-handles are pointer sized; declare them so they are not truncated
+    _kernel32.GetCurrentThread.restype = wintypes.HANDLE
+    _kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    _kernel32.SetThreadPriority.argtypes = (wintypes.HANDLE, ctypes.c_int)
+    try:
+        _SetProcessInformation = _kernel32.SetProcessInformation
+        _SetProcessInformation.argtypes = (
+            wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD)
+    except AttributeError:
+        _SetProcessInformation = None   # needs Windows 8+
+
+    def boost_current_thread():
+        """Raise the calling thread's scheduling priority."""
+        _kernel32.SetThreadPriority(_kernel32.GetCurrentThread(),
+                                    THREAD_PRIORITY_HIGHEST)
+
+    def disable_power_throttling():
+        """Opt the process out of EcoQoS (Windows 10 1709+). The
+        timer-resolution flag only exists on Windows 11, so retry without it."""
+        if _SetProcessInformation is None:
+            return
+        for control in (PROCESS_POWER_THROTTLING_EXECUTION_SPEED
+                        | PROCESS_POWER_THROTTLING_IGNORE_TIMER_RESOLUTION,
+                        PROCESS_POWER_THROTTLING_EXECUTION_SPEED):
+            # ControlMask = policies we manage, StateMask = 0 → all turned off
+            state = _PROCESS_POWER_THROTTLING_STATE(
+                PROCESS_POWER_THROTTLING_CURRENT_VERSION, control, 0)
+            if _SetProcessInformation(
+                    _kernel32.GetCurrentProcess(), ProcessPowerThrottling,
+                    ctypes.byref(state), ctypes.sizeof(state)):
+                return
+else:
+    def boost_current_thread():
+        pass
+
+    def disable_power_throttling():
+        pass
+
+
 # ==============================
 # Defaults
 # ==============================
@@ -52,35 +280,332 @@ DEFAULT_INTERVAL = 5.0
 DEFAULT_FILENAME = "click_routine.json"
 DEFAULT_RANDOMNESS = 0.3   # 0.0 = none, 1.0 = maximum
 DRAG_THRESHOLD_PX = 5      # pixels of movement to distinguish drag from click
+_DRAG_THRESHOLD_SQ = DRAG_THRESHOLD_PX * DRAG_THRESHOLD_PX
+TIMELINE_PUMP_MS = 50      # how often recorded rows are flushed to the timeline
+STOP_CHECK_MARGIN = 0.02   # tail of a playback wait that is slept precisely (s)
+RECORD_BUFFER_SIZE = 65536  # clicks buffered between timeline pumps (power of 2)
 
 
 # ==============================
 # Utility
 # ==============================
-def randomize(value, strength=DEFAULT_RANDOMNESS):
-    """Apply randomness to a numeric value scaled by strength (0.0–1.0)."""
-    if strength == 0:
-        return value
-    if isinstance(value, float):
-        delta = value * strength * 0.5
-        return value + uniform(-delta, delta)
-    if isinstance(value, int):
-        delta = max(1, int(abs(value) * strength * 0.1))
-        return value + int(uniform(-delta, delta))
-    return value
+# numba is optional — when present, drag paths are generated in native code.
+# It is imported and compiled by warm_drag_path(), which playback calls before
+# a routine with drags, so launches and click-only routines never pay for it
+# and the JIT never runs in the middle of a timed routine.
+np = None             # numpy, bound by warm_drag_path()
+_drag_kernel = None   # compiled _drag_path, once warmed
+_drag_kernel_tried = False
+
+
+def _drag_path(x1, y1, x2, y2, steps):
+    xs = np.empty(steps + 1, np.int32)
+    ys = np.empty(steps + 1, np.int32)
+    dx, dy = x2 - x1, y2 - y1
+    for i in range(steps + 1):
+        xs[i] = int(x1 + dx * i / steps)
+        ys[i] = int(y1 + dy * i / steps)
+    return xs, ys
+
+
+def warm_drag_path():
+    """Import numba and compile the drag kernel, once. Without numba, or if
+    it fails to import or compile, drag_path() keeps the pure-Python path."""
+    global np, _drag_kernel, _drag_kernel_tried
+    if _drag_kernel_tried:
+        return
+    _drag_kernel_tried = True
+    try:
+        import numba
+        import numpy as np
+        kernel = numba.njit(cache=True, fastmath=True)(_drag_path)
+        kernel(0, 0, 1, 1, 1)   # compile (or load from cache) now
+    except Exception:
+        return   # optional accelerator: never let it break playback
+    _drag_kernel = kernel
+
+
+@lru_cache(maxsize=64)
+def _step_fractions(steps):
+    """0.0 … 1.0 in `steps` equal increments; shared by equal-length drags."""
+    return tuple(i / steps for i in range(steps + 1))
+
+
+def drag_path(x1, y1, x2, y2, steps):
+    """Return the `steps + 1` integer (x, y) points of a straight drag."""
+    if _drag_kernel is not None:
+        xs, ys = _drag_kernel(x1, y1, x2, y2, steps)
+        return list(zip(xs.tolist(), ys.tolist()))
+    dx, dy = x2 - x1, y2 - y1
+    return [(int(x1 + dx * t), int(y1 + dy * t))
+            for t in _step_fractions(steps)]
+
+
+def hotkey_code(key):
+    """Return a hashable code for a pynput key or a one-character hotkey
+    string: the virtual-key code for special keys, the lower-case char
+    otherwise. Hotkey tables are keyed on this so a keystroke is matched with
+    one dict lookup."""
+    if isinstance(key, str):
+        return key.lower()
+    if isinstance(key, Key):
+        return key.value.vk
+    char = getattr(key, "char", None)
+    if char:
+        return char.lower()
+    return getattr(key, "vk", key)
+
+
+# Low-level mouse messages that no listener here cares about
+_WIN32_MOTION_MSGS = frozenset((
+    0x0200,   # WM_MOUSEMOVE
+    0x020A,   # WM_MOUSEWHEEL
+    0x020E,   # WM_MOUSEHWHEEL
+))
+
+
+def ignore_motion_filter(msg, data):
+    """pynput win32_event_filter that stops move/wheel messages before pynput
+    decodes and dispatches them. The events still reach other applications."""
+    return msg not in _WIN32_MOTION_MSGS
+
+
+_KEY_MAP = dict(Key.__members__)   # 'f8' → Key.f8, ... for this platform
 
 
 def parse_hotkey(user_input, default):
     """Convert a string like 'f8' or 'esc' to a pynput Key object."""
     try:
         s = user_input.strip().lower()
-        if hasattr(Key, s):
-            return getattr(Key, s)
-        if len(s) == 1:
-            return s
-    except Exception:
-        pass
-    return default
+    except AttributeError:
+        return default
+    key = _KEY_MAP.get(s)
+    if key is not None:
+        return key
+    return s if len(s) == 1 else default
+
+
+# ==============================
+# Events
+# Slotted objects instead of dicts: about a fifth of the memory per event and
+# plain attribute reads. Routine files keep the original JSON layout.
+# ==============================
+class ClickEvent:
+    """A single click. `delay` is the wait before it (None = use settings);
+    `hold` is how long the button stays down (None = human-like random,
+    0 = press and release in one go)."""
+    __slots__ = ("button", "x", "y", "delay", "hold")
+    type = "click"
+
+    def __init__(self, button, x, y, delay=None, hold=None):
+        self.button = button
+        self.x = x
+        self.y = y
+        self.delay = delay
+        self.hold = hold
+
+    def to_dict(self):
+        d = {"type": "click", "button": self.button, "x": self.x, "y": self.y}
+        if self.delay is not None:
+            d["delay"] = self.delay
+        if self.hold is not None:
+            d["hold"] = self.hold
+        return d
+
+
+class DragEvent:
+    """A press at (x, y), a straight move to (end_x, end_y) and a release."""
+    __slots__ = ("button", "x", "y", "end_x", "end_y", "delay", "duration")
+    type = "drag"
+
+    def __init__(self, button, x, y, end_x, end_y, delay=None, duration=0.3):
+        self.button = button
+        self.x = x
+        self.y = y
+        self.end_x = end_x
+        self.end_y = end_y
+        self.delay = delay
+        self.duration = duration
+
+    def to_dict(self):
+        d = {"type": "drag", "button": self.button, "x": self.x, "y": self.y,
+             "end_x": self.end_x, "end_y": self.end_y,
+             "duration": self.duration}
+        if self.delay is not None:
+            d["delay"] = self.delay
+        return d
+
+
+def event_from_dict(d):
+    """Build a ClickEvent / DragEvent from its JSON form.
+    Old routines have no "type" field and are treated as clicks."""
+    button = d.get("button", "left")
+    delay = d.get("delay")
+    if delay is not None:
+        delay = float(delay)
+    if d.get("type", "click") == "drag":
+        return DragEvent(button, int(d["x"]), int(d["y"]),
+                         int(d["end_x"]), int(d["end_y"]),
+                         delay, float(d.get("duration", 0.3)))
+    hold = d.get("hold")
+    if hold is not None:
+        hold = max(0.0, float(hold))
+    return ClickEvent(button, int(d["x"]), int(d["y"]), delay, hold)
+
+
+_ROUTINE_CACHE = {}   # path → ((mtime_ns, size), events)
+
+
+def load_routine(path):
+    """Read a routine file into a new list of events. Parsed routines are
+    cached per (path, mtime, size), so reloading an unchanged file skips the
+    JSON parse. Event objects are shared with the cache and never mutated."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _ROUTINE_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return list(hit[1])
+    with open(path, "rb") as f:
+        events = [event_from_dict(ev) for ev in _loads(f.read())]
+    _ROUTINE_CACHE[path] = (stamp, events)
+    return list(events)
+
+
+# ==============================
+# Event Table
+# Playback reads a column-oriented copy of the routine so the hot loop does
+# plain array reads and integer compares instead of dict lookups.
+# ==============================
+EVENT_CLICK, EVENT_DRAG = 0, 1
+BUTTON_LEFT, BUTTON_RIGHT = 0, 1
+BUTTON_CODES = {"left": BUTTON_LEFT, "right": BUTTON_RIGHT}
+_BUTTONS = (Button.left, Button.right)   # indexed by button code
+_BUTTON_NAMES = {Button.left: "left", Button.right: "right"}
+
+
+@dataclass
+class EventTable:
+    """Structure-of-arrays view of a routine (one column per event field).
+    Missing delays and random click holds are stored as NaN and resolved by
+    the player."""
+    types: array
+    buttons: array
+    xs: array
+    ys: array
+    end_xs: array
+    end_ys: array
+    delays: array
+    durations: array
+    holds: array
+
+    @classmethod
+    def from_events(cls, events):
+        table = cls(array("B"), array("B"), array("i"), array("i"),
+                    array("i"), array("i"), array("d"), array("d"), array("d"))
+        for ev in events:
+            is_drag = ev.type == "drag"
+            table.types.append(EVENT_DRAG if is_drag else EVENT_CLICK)
+            table.buttons.append(BUTTON_CODES.get(ev.button, BUTTON_RIGHT))
+            table.xs.append(ev.x)
+            table.ys.append(ev.y)
+            table.end_xs.append(ev.end_x if is_drag else 0)
+            table.end_ys.append(ev.end_y if is_drag else 0)
+            table.delays.append(math.nan if ev.delay is None else ev.delay)
+            table.durations.append(ev.duration if is_drag else 0.0)
+            hold = None if is_drag else ev.hold
+            table.holds.append(math.nan if hold is None else hold)
+        return table
+
+    def __len__(self):
+        return len(self.types)
+
+
+# ==============================
+# Mouse Backends
+# The player drives the mouse through move / press / release plus a
+# prepare_path / move_step pair for drags. pynput is the portable default;
+# on Windows SendInput is called directly, skipping pynput's dispatch layer.
+# ==============================
+class _MouseBackend:
+    """pynput-based backend, used wherever no native backend exists."""
+
+    def __init__(self):
+        self._mouse = Controller()
+
+    def move(self, x, y):
+        self._mouse.position = (x, y)
+
+    def press(self, button):
+        self._mouse.press(button)
+
+    def release(self, button):
+        self._mouse.release(button)
+
+    def click(self, button):
+        """Press and release with no hold in between."""
+        self._mouse.press(button)
+        self._mouse.release(button)
+
+    def prepare_path(self, path):
+        """Turn a list of (x, y) points into whatever move_step() replays."""
+        return path
+
+    def move_step(self, prepared, index):
+        self._mouse.position = prepared[index]
+
+
+if sys.platform == "win32":
+    class _SendInputMouse(_MouseBackend):
+        """Backend that submits INPUT records to SendInput directly.
+        The INPUT records for moves and button presses are built once and
+        reused; an instance is only ever driven from one thread."""
+        _FLAGS = {   # button → (down, up)
+            Button.left: (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+            Button.right: (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+            Button.middle: (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+        }
+
+        def __init__(self):
+            # no pynput Controller needed
+            self._move_input = _win_move_batch(((0, 0),))
+            self._button_inputs = {}   # button → INPUT[2] holding (down, up)
+            self._up_inputs = {}       # button → typed pointer to the up record
+            for button, (down, up) in self._FLAGS.items():
+                inputs = (_INPUT * 2)((INPUT_MOUSE,), (INPUT_MOUSE,))
+                inputs[0].mi.dwFlags = down
+                inputs[1].mi.dwFlags = up
+                self._button_inputs[button] = inputs
+                self._up_inputs[button] = ctypes.pointer(inputs[1])
+
+        def move(self, x, y):
+            move_input = self._move_input
+            _win_set_pos(move_input[0], x, y)
+            _SendInput(1, move_input, _INPUT_SIZE)
+
+        def press(self, button):
+            _SendInput(1, self._button_inputs[button], _INPUT_SIZE)
+
+        def release(self, button):
+            _SendInput(1, self._up_inputs[button], _INPUT_SIZE)
+
+        def click(self, button):
+            # down + up in one SendInput call: one kernel transition
+            _SendInput(2, self._button_inputs[button], _INPUT_SIZE)
+
+        def prepare_path(self, path):
+            # one typed pointer per record, built before the button goes down;
+            # each keeps the underlying INPUT array alive
+            return [ctypes.pointer(inp) for inp in _win_move_batch(path)]
+
+        def move_step(self, prepared, index):
+            _SendInput(1, prepared[index], _INPUT_SIZE)
+
+
+def make_mouse_backend():
+    """Return the fastest mouse backend available on this platform."""
+    if sys.platform == "win32":
+        return _SendInputMouse()
+    return _MouseBackend()
 
 
 # ==============================
@@ -89,66 +614,170 @@ def parse_hotkey(user_input, default):
 class ClickPlayer(threading.Thread):
     def __init__(self, config_getter, events_getter, status_cb=None):
         super().__init__(daemon=True)
-        self.mouse = Controller()
+        self.mouse = make_mouse_backend()
         self.config_getter = config_getter   # callable → dict
-        self.events_getter = events_getter   # callable → list
+        self.events_getter = events_getter   # callable → EventTable
         self._running = threading.Event()
+        self._stopped = threading.Event()    # set while paused / shutting down
+        self._cancel_gen = 0                 # bumped on every stop; lock-free check
         self._alive = True
         self.loop_count = 0
         self.status_cb = status_cb or (lambda msg: None)
+        self._zeros = []   # reused jitter when randomness is 0
+        self._compiled_table = None
+        self._compiled = []
+        self._click_plan = None   # (button, x, y) per event when there are no drags
+        self._bounds_key = (None, None)   # (table, strength) of self._bounds
+        self._bounds = ()
 
     # --- event performers ---
 
-    def _pre_delay(self, event, strength):
-        """Wait for the per-event delay.
+    def _wait(self, seconds):
+        """Sleep for `seconds`; returns False early if playback is stopped.
+        The bulk of a long wait blocks on the stop Event so Pause is honoured
+        at once; the rest runs to an absolute deadline with
+        precise_sleep_until(), absorbing the Event's scheduler-tick overshoot."""
+        deadline = perf_counter() + seconds
+        coarse = seconds - STOP_CHECK_MARGIN
+        if coarse > 0 and self._stopped.wait(coarse):
+            return False
+        precise_sleep_until(deadline)
+        return not self._stopped.is_set()
+
+    def _loop_delays(self, table, cfg, strength):
+        """Resolve and randomise every pre-event delay for one routine pass.
         'recorded' mode uses the captured inter-event timing (falls back to
         the global setting if no timing was stored).
         'settings' mode always uses the global Click Delay value.
         """
-        cfg = self.config_getter()
+        fallback = float(cfg["delay"])
         if cfg.get("delay_mode", "recorded") == "settings":
-            raw = cfg["delay"]
+            raw = [fallback] * len(table)
         else:
-            raw = event.get("delay", cfg["delay"])
-        sleep(max(0.0, randomize(float(raw), strength)))
-
-    def perform_click(self, event, strength):
-        self._pre_delay(event, strength)
-        x = int(randomize(event["x"], strength))
-        y = int(randomize(event["y"], strength))
-        button = Button.left if event.get("button", "left") == "left" else Button.right
-        self.mouse.position = (x, y)
-        self.mouse.press(button)
-        sleep(uniform(0.05, 0.1 + strength * 0.2))
-        self.mouse.release(button)
-
-    def perform_drag(self, event, strength):
-        self._pre_delay(event, strength)
-        x1 = int(randomize(event["x"], strength))
-        y1 = int(randomize(event["y"], strength))
-        x2 = int(randomize(event["end_x"], strength))
-        y2 = int(randomize(event["end_y"], strength))
-        button = Button.left if event.get("button", "left") == "left" else Button.right
-        duration = max(0.05, float(event.get("duration", 0.3)))
-        steps = max(10, int(duration * 60))
-
-        self.mouse.position = (x1, y1)
-        self.mouse.press(button)
-        for i in range(steps + 1):
-            if not self._running.is_set():
-                break
-            t = i / steps
-            self.mouse.position = (int(x1 + (x2 - x1) * t), int(y1 + (y2 - y1) * t))
-            sleep(duration / steps)
-        self.mouse.release(button)
+            raw = [fallback if math.isnan(d) else d for d in table.delays]
+        if strength == 0:
+            return raw
+        # d ± d * strength / 2, drawn with bare random() instead of uniform()
+        lo, span = 1.0 - strength * 0.5, strength
+        rand = random
+        return [max(0.0, d * (lo + span * rand())) for d in raw]
+
+    def _compile(self, table):
+        """Flatten the table into per-event tuples
+        (kind, button, x, y, end_x, end_y, duration, steps) with the pynput
+        button and the drag timing already resolved. Rebuilt only when the
+        App hands over a new table. Click-only routines also get a slimmer
+        (button, x, y) plan in self._click_plan so run() can skip the
+        per-event kind check; it is None when the routine contains a drag."""
+        if table is not self._compiled_table:
+            compiled = []
+            for kind, code, x, y, end_x, end_y, duration in zip(
+                    table.types, table.buttons, table.xs, table.ys,
+                    table.end_xs, table.end_ys, table.durations):
+                if kind == EVENT_DRAG:
+                    duration = max(0.05, duration)
+                    steps = max(10, int(duration * 60))
+                else:
+                    duration, steps = 0.0, 0
+                compiled.append((kind, _BUTTONS[code], x, y,
+                                 end_x, end_y, duration, steps))
+            self._compiled_table, self._compiled = table, compiled
+            if EVENT_DRAG in table.types:
+                self._click_plan = None
+                warm_drag_path()   # JIT here, before the pass starts
+            else:
+                self._click_plan = [(c[1], c[2], c[3]) for c in compiled]
+        return self._compiled
+
+    def _jitter_bounds(self, table, strength):
+        """Per-event jitter half-widths for (xs, ys, end_xs, end_ys): at least
+        1 px, growing with the coordinate and the randomness strength.
+        Cached until the table or the strength changes."""
+        if self._bounds_key[0] is not table or self._bounds_key[1] != strength:
+            scale = strength * 0.1
+            self._bounds = tuple(
+                [max(1, int(abs(v) * scale)) for v in column]
+                for column in (table.xs, table.ys, table.end_xs, table.end_ys))
+            self._bounds_key = (table, strength)
+        return self._bounds
+
+    def _precompute_jitter(self, table, strength):
+        """Draw all random offsets for one routine pass in a single sweep.
+        Returns (dx, dy, end_dx, end_dy, holds); holds are the press durations
+        of clicks. Offsets are scaled from random() directly, which skips
+        the Python-level frame uniform() costs per draw.
+        """
+        n = len(table)
+        hold_span = 0.05 + strength * 0.2   # up to 0.1 + strength * 0.2 s
+        isnan = math.isnan
+        rand = random
+        holds = [0.05 + hold_span * rand() if isnan(h) else h for h in table.holds]
+        if strength == 0:
+            if len(self._zeros) != n:
+                self._zeros = [0] * n
+            zeros = self._zeros
+            return zeros, zeros, zeros, zeros, holds
+
+        dx, dy, end_dx, end_dy = (
+            [int(d * (2.0 * rand() - 1.0)) for d in bounds]
+            for bounds in self._jitter_bounds(table, strength))
+        return dx, dy, end_dx, end_dy, holds
+
+    def perform_click(self, x, y, button, hold):
+        mouse = self.mouse
+        mouse.move(x, y)
+        if hold <= 0:
+            mouse.click(button)
+            return
+        mouse.press(button)
+        precise_sleep(hold)
+        mouse.release(button)
+
+    def perform_drag(self, x1, y1, x2, y2, button, duration, steps, gen):
+        """Drag along a straight path; aborts once `gen` is stale."""
+        path = drag_path(x1, y1, x2, y2, steps)
+        # loop invariants bound to locals: no global / attribute lookups per step
+        step_time = duration / steps
+        sleep_until = precise_sleep_until
+        mouse = self.mouse
+
+        moves = mouse.prepare_path(path)
+        move_step = mouse.move_step
+
+        mouse.move(x1, y1)
+        mouse.press(button)
+        try:
+            t0 = perf_counter()
+            for step in range(len(path)):
+                if self._cancel_gen != gen:
+                    break
+                move_step(moves, step)
+                sleep_until(t0 + (step + 1) * step_time)
+        finally:
+            # never leave the button held down system-wide
+            mouse.release(button)
 
     # --- thread loop ---
 
     def run(self):
+        boost_current_thread()
         while self._alive:
-            self._running.wait()
+            # re-check the predicate after every wake-up; shutdown() sets the
+            # Event too, and must not fall through into a playback pass
+            while self._alive and not self._running.is_set():
+                self._running.wait()
+            if not self._alive:
+                return
+            gen = self._cancel_gen
+            table = self.events_getter()
+            # pause (not exit) on an empty routine: no config read, no
+            # random draws, and no interval wake-ups until Play is pressed
+            if not len(table):
+                self._running.clear()
+                self.status_cb("No events to play.")
+                continue
+
             cfg = self.config_getter()
-            events = self.events_getter()
             strength = cfg.get("randomness", DEFAULT_RANDOMNESS)
             max_loops = cfg.get("max_loops", 0)
 
@@ -157,32 +786,49 @@ class ClickPlayer(threading.Thread):
                 self._running.clear()
                 continue
 
-            if not events:
-                self._running.clear()
-                self.status_cb("No events to play.")
-                continue
-
-            for event in events:
-                if not self._running.is_set():
-                    break
-                if event.get("type", "click") == "drag":
-                    self.perform_drag(event, strength)
-                else:
-                    self.perform_click(event, strength)
+            compiled = self._compile(table)
+            delays = self._loop_delays(table, cfg, strength)
+            dx, dy, end_dx, end_dy, holds = self._precompute_jitter(table, strength)
+            # bind everything the inner loop touches to locals
+            perform_click, perform_drag = self.perform_click, self.perform_drag
+            wait = self._wait
+            click_plan = self._click_plan
+            if click_plan is not None:
+                # specialised loop for the common all-clicks routine
+                for i, (button, x, y) in enumerate(click_plan):
+                    if self._cancel_gen != gen or not wait(delays[i]):
+                        break
+                    perform_click(x + dx[i], y + dy[i], button, holds[i])
+            else:
+                for i, (kind, button, x, y, end_x, end_y, duration, steps) \
+                        in enumerate(compiled):
+                    # a plain int compare instead of taking the Event's lock
+                    if self._cancel_gen != gen or not wait(delays[i]):
+                        break
+                    if kind == EVENT_DRAG:
+                        perform_drag(x + dx[i], y + dy[i],
+                                     end_x + end_dx[i], end_y + end_dy[i],
+                                     button, duration, steps, gen)
+                    else:
+                        perform_click(x + dx[i], y + dy[i], button, holds[i])
 
             self.loop_count += 1
             interval = cfg.get("interval", DEFAULT_INTERVAL)
-            sleep(max(0.0, randomize(interval, strength)))
+            spread = interval * strength * 0.5
+            self._wait(max(0.0, uniform(interval - spread, interval + spread)))
 
     # --- controls ---
 
     def start_clicking(self):
         self.status_cb("Playing")
+        self._stopped.clear()
         self._running.set()
 
     def stop_clicking(self):
         self.status_cb("Paused")
+        self._cancel_gen += 1
         self._running.clear()
+        self._stopped.set()
 
     def toggle(self):
         if self._running.is_set():
@@ -192,9 +838,49 @@ class ClickPlayer(threading.Thread):
 
     def shutdown(self):
         self._alive = False
+        self._cancel_gen += 1
+        self._stopped.set()
         self._running.set()
 
 
+# ==============================
+# SPSC Ring Buffer
+# ==============================
+class SPSCRing:
+    """
+    Preallocated single-producer / single-consumer ring buffer.
+    Only the producer writes `_head` and only the consumer writes `_tail`;
+    plain int stores are atomic under the GIL, so no lock is taken on either
+    side. Pushes onto a full ring are dropped and counted.
+    """
+
+    def __init__(self, capacity=RECORD_BUFFER_SIZE):
+        assert capacity & (capacity - 1) == 0, "capacity must be a power of 2"
+        self._buf = [None] * capacity
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._head = 0   # next slot to write (producer)
+        self._tail = 0   # next slot to read (consumer)
+        self.dropped = 0
+
+    def push(self, item):
+        head = self._head
+        if head - self._tail >= self._capacity:
+            self.dropped += 1
+            return False
+        self._buf[head & self._mask] = item
+        self._head = head + 1      # publish only after the slot is written
+        return True
+
+    def drain(self):
+        """Return every pending item in FIFO order."""
+        head, tail = self._head, self._tail
+        buf, mask = self._buf, self._mask
+        items = [buf[i & mask] for i in range(tail, head)]
+        self._tail = head
+        return items
+
+
 # ==============================
 # Recorder
 # ==============================
@@ -204,28 +890,35 @@ class Recorder:
     - Left / Right click → "click" event
     - Left / Right click + significant movement → "drag" event
     - stop_trigger: Button.middle (default) or a pynput Key / char that stops recording
+    The listener thread only pushes raw (x, y, button, pressed, t_ns) tuples into
+    a ring buffer; drain() turns them into events on the UI thread.
     """
 
-    def __init__(self, on_event_cb, on_done_cb, stop_trigger=None):
-        self.on_event_cb = on_event_cb
+    def __init__(self, on_done_cb, stop_trigger=None):
         self.on_done_cb = on_done_cb
         self.stop_trigger = stop_trigger if stop_trigger is not None else Button.middle
         self.events = []
+        self._ring = SPSCRing()
         self._press_info = {}
         self._last_event_time = None
+        self._stop_button = None
         self._listener = None
         self._kb_listener = None
 
     def start(self):
         self.events = []
         self._press_info = {}
-        self._last_event_time = time()
-        self._listener = MouseListener(on_click=self._on_click)
+        self._last_event_time = monotonic_ns()
+        self._stop_button = Button.middle if self.stop_trigger is Button.middle else None
+        self._listener = MouseListener(on_click=self._on_click,
+                                       win32_event_filter=ignore_motion_filter)
         self._listener.start()
         # If the stop trigger is a keyboard key, also start a keyboard listener
         if self.stop_trigger is not Button.middle:
+            stop_code = hotkey_code(self.stop_trigger)
+
             def on_press(key):
-                if key == self.stop_trigger:
+                if hotkey_code(key) == stop_code:
                     self._stop_and_done()
                     return False
             self._kb_listener = KeyboardListener(on_press=on_press)
@@ -237,48 +930,52 @@ class Recorder:
             self._listener.stop()
         if self._kb_listener and self._kb_listener.is_alive():
             self._kb_listener.stop()
-        self.on_done_cb(self.events)
+        self.on_done_cb()
 
     def _on_click(self, x, y, button, pressed):
-        if button == Button.middle and pressed and self.stop_trigger is Button.middle:
-            self._stop_and_done()
-            return False
-
-        if button not in (Button.left, Button.right):
+        # Runs on the hook thread: keep it to the stop check and one push.
+        if button is self._stop_button:
+            if pressed:
+                self._stop_and_done()
+                return False
             return
-
-        now = time()
-        if pressed:
-            self._press_info[button] = (x, y, now)
-        else:
+        self._ring.push((x, y, button, pressed, monotonic_ns()))
+
+    def drain(self):
+        """Build events from the buffered clicks. Call from the UI thread.
+        Returns the events completed by this call."""
+        new_events = []
+        for x, y, button, pressed, now in self._ring.drain():
+            btn_str = _BUTTON_NAMES.get(button)
+            if btn_str is None:
+                continue
+            if pressed:
+                self._press_info[button] = (x, y, now)
+                continue
             if button not in self._press_info:
-                return
+                continue
             px, py, press_time = self._press_info.pop(button)
-            delay = press_time - self._last_event_time
+            delay = (press_time - self._last_event_time) / 1e9
             self._last_event_time = now
-            duration = now - press_time
-            btn_str = "left" if button == Button.left else "right"
-            dx, dy = abs(x - px), abs(y - py)
-
-            if dx > DRAG_THRESHOLD_PX or dy > DRAG_THRESHOLD_PX:
-                event = {
-                    "type": "drag",
-                    "button": btn_str,
-                    "x": px, "y": py,
-                    "end_x": x, "end_y": y,
-                    "duration": round(duration, 3),
-                    "delay": round(max(0.0, delay), 3),
-                }
+            duration = (now - press_time) / 1e9
+            dx, dy = x - px, y - py
+
+            if dx * dx + dy * dy > _DRAG_THRESHOLD_SQ:
+                event = DragEvent(btn_str, px, py, x, y,
+                                  delay=round(max(0.0, delay), 3),
+                                  duration=round(duration, 3))
             else:
-                event = {
-                    "type": "click",
-                    "button": btn_str,
-                    "x": px, "y": py,
-                    "delay": round(max(0.0, delay), 3),
-                }
+                event = ClickEvent(btn_str, px, py,
+                                   delay=round(max(0.0, delay), 3))
 
-            self.events.append(event)
-            self.on_event_cb(event)
+            new_events.append(event)
+        self.events.extend(new_events)
+        return new_events
+
+    @property
+    def dropped(self):
+        """Clicks lost because the ring was full when they arrived."""
+        return self._ring.dropped
 
     def stop(self):
         if self._listener and self._listener.is_alive():
@@ -294,19 +991,28 @@ class App(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("pressingClicks — Advanced Auto Clicker")
-        try:
-            self.iconbitmap("icon.ico")
-        except Exception:
-            pass  # icon not found — silently fall back to default
+        if sys.platform == "win32":   # Tk only accepts .ico files on Windows
+            try:
+                self.iconbitmap("icon.ico")
+            except Exception:
+                pass  # icon not found — silently fall back to default
         self.resizable(False, False)
+        disable_power_throttling()
 
         self.events = []
-        self.player = None
+        self.table = EventTable.from_events(self.events)
+        self.player = None             # started on first Play
         self.recorder = None
         self.kb_listener = None
+        self._mouse_listener = None    # only started for middle-click capture
+        self._key_bindings = {}        # hotkey_code() → callback
+        self._capture = None           # (var, button, text, allow_mouse) while capturing
+        self._pump_id = None
+        self._status_msg = ""
+        self._status_pending = False   # a _flush_status is already queued
 
         self._build_ui()
-        self._start_player()
+        self._start_hotkey_listener()
         self._apply_hotkeys()          # load default hotkeys on startup
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
@@ -467,7 +1173,11 @@ class App(tk.Tk):
         }
 
     def _get_events(self):
-        return self.events
+        return self.table
+
+    def _events_changed(self):
+        """Rebuild the playback table after self.events was edited."""
+        self.table = EventTable.from_events(self.events)
 
     def _start_player(self):
         self.player = ClickPlayer(
@@ -486,11 +1196,13 @@ class App(tk.Tk):
             messagebox.showwarning("No Events",
                                    "Record or load a routine first.")
             return
+        if self.player is None:
+            self._start_player()
         self.player.toggle()
         self._update_play_btn()
 
     def _update_play_btn(self):
-        if self.player._running.is_set():
+        if self.player and self.player._running.is_set():
             self.play_btn.config(text="\u23f8 Pause")
         else:
             self.play_btn.config(text="\u25b6 Play")
@@ -504,59 +1216,79 @@ class App(tk.Tk):
                      and self.recorder._listener.is_alive())
         if recording:
             self.recorder.stop()
-            self._finish_recording(self.recorder.events)
+            self._finish_recording()
         else:
-            if self.player._running.is_set():
+            if self.player and self.player._running.is_set():
                 self.player.stop_clicking()
                 self._update_play_btn()
             # clear previous data for a fresh recording
             self.events = []
+            self._events_changed()
             self._refresh_timeline()
             self._set_status("Recording…  Middle Click to stop.")
             self.record_btn.config(text="\u23f9 Stop Recording")
             self.recorder = Recorder(
-                on_event_cb=self._on_record_event,
                 on_done_cb=self._on_record_done,
                 stop_trigger=self._parse_stop_rec_key(),
             )
             self.recorder.start()
+            self._pump_timeline()
             self.iconify()
 
-    def _on_record_event(self, event):
-        """Called from the listener thread — schedule UI update on main thread."""
-        self.after(0, self._add_timeline_row, event,
-                   len(self.recorder.events) - 1)
+    def _pump_timeline(self):
+        """Drain the recorder into the timeline in one pass every
+        TIMELINE_PUMP_MS; reschedules itself while recording."""
+        if self._pump_id is not None:
+            self.after_cancel(self._pump_id)
+            self._pump_id = None
+        if self.recorder:
+            new_events = self.recorder.drain()
+            if new_events:
+                add_row = self._add_timeline_row
+                first = len(self.recorder.events) - len(new_events)
+                for index, event in enumerate(new_events, start=first):
+                    add_row(event, index)
+        if self.recorder and self.recorder._listener \
+                and self.recorder._listener.is_alive():
+            self._pump_id = self.after(TIMELINE_PUMP_MS, self._pump_timeline)
 
-    def _on_record_done(self, events):
-        self.after(0, self._finish_recording, events)
+    def _on_record_done(self):
+        self.after(0, self._finish_recording)
 
-    def _finish_recording(self, events):
+    def _finish_recording(self):
+        self._pump_timeline()   # flush clicks still waiting in the ring
+        events = self.recorder.events
         self.events = list(events)
+        self._events_changed()
         self.record_btn.config(text="\u23fa Record")
-        self._set_status(f"Recorded {len(events)} event(s).")
+        msg = f"Recorded {len(events)} event(s)."
+        if self.recorder.dropped:
+            msg += f"  ({self.recorder.dropped} click(s) dropped)"
+        self._set_status(msg)
         self.deiconify()
 
     # =========================================================
     # Timeline helpers
     # =========================================================
     def _add_timeline_row(self, event, index):
-        etype = event.get("type", "click")
+        is_drag = event.type == "drag"
         row = (
             index + 1,
-            etype,
-            event.get("button", ""),
-            event.get("x", ""),
-            event.get("y", ""),
-            event.get("end_x", "-") if etype == "drag" else "-",
-            event.get("end_y", "-") if etype == "drag" else "-",
-            f"{event.get('delay', 0):.3f}",
-            f"{event.get('duration', 0):.3f}" if etype == "drag" else "-",
+            event.type,
+            event.button,
+            event.x,
+            event.y,
+            event.end_x if is_drag else "-",
+            event.end_y if is_drag else "-",
+            f"{event.delay or 0:.3f}",
+            f"{event.duration:.3f}" if is_drag else "-",
         )
         self.timeline.insert("", "end", values=row)
 
     def _refresh_timeline(self):
-        for item in self.timeline.get_children():
-            self.timeline.delete(item)
+        children = self.timeline.get_children()
+        if children:
+            self.timeline.delete(*children)
         for i, event in enumerate(self.events):
             self._add_timeline_row(event, i)
 
@@ -574,11 +1306,15 @@ class App(tk.Tk):
         self.timeline.delete(selected[0])
         if 0 <= idx < len(self.events):
             del self.events[idx]
-        self._refresh_timeline()
+            self._events_changed()
+        # renumber only the rows that moved up instead of rebuilding the table
+        for n, item in enumerate(self.timeline.get_children()[idx:], start=idx + 1):
+            self.timeline.set(item, "Index", n)
 
     def _clear_events(self):
         if messagebox.askyesno("Clear", "Clear all recorded events?"):
             self.events = []
+            self._events_changed()
             self._refresh_timeline()
             self._set_status("Cleared.")
 
@@ -595,8 +1331,8 @@ class App(tk.Tk):
             initialfile=DEFAULT_FILENAME,
         )
         if path:
-            with open(path, "w") as f:
-                json.dump(self.events, f, indent=4)
+            with open(path, "wb") as f:
+                f.write(_dumps([ev.to_dict() for ev in self.events]))
             self._set_status(f"Saved to {path}")
 
     def _load_routine(self):
@@ -606,12 +1342,10 @@ class App(tk.Tk):
         if not path:
             return
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            # backward-compat: old format has no "type" field → treat as click
-            for ev in data:
-                ev.setdefault("type", "click")
-            self.events = data
+            # build everything first so a bad file leaves the old routine intact
+            events = load_routine(path)
+            table = EventTable.from_events(events)
+            self.events, self.table = events, table
             self._refresh_timeline()
             self._set_status(f"Loaded {len(self.events)} event(s) from {path}")
         except Exception as e:
@@ -620,22 +1354,40 @@ class App(tk.Tk):
     # =========================================================
     # Hotkeys
     # =========================================================
-    def _apply_hotkeys(self):
-        if self.kb_listener:
-            self.kb_listener.stop()
+    def _start_hotkey_listener(self):
+        """Start the single keyboard listener that lives as long as the app.
+        Hotkeys and key capture are both routed through it."""
+        self.kb_listener = KeyboardListener(on_press=self._on_global_key)
+        self.kb_listener.daemon = True
+        self.kb_listener.start()
+
+    def _on_global_key(self, key):
+        """Persistent listener callback — runs on the listener thread."""
+        if self._capture is not None:
+            try:
+                name = key.name          # special key, e.g. 'f8', 'esc'
+            except AttributeError:
+                name = key.char or str(key)   # regular character
+            self.after(0, self._finish_key_capture, name)
+            return
+        cb = self._key_bindings.get(hotkey_code(key))
+        if cb is not None:
+            self.after(0, cb)
 
+    def _on_global_click(self, x, y, button, pressed):
+        """Capture-mode mouse listener callback — runs on the listener thread."""
+        capture = self._capture
+        if capture is not None and capture[3] and pressed \
+                and button == Button.middle:
+            self.after(0, self._finish_key_capture, "middle")
+
+    def _apply_hotkeys(self):
         start_key = parse_hotkey(self.start_key_var.get(), Key.f8)
         exit_key = Key.esc  # hardcoded — Esc always exits
 
-        def on_press(key):
-            if key == start_key:
-                self.after(0, self._toggle_play)
-            elif key == exit_key:
-                self.after(0, self._on_close)
-
-        self.kb_listener = KeyboardListener(on_press=on_press)
-        self.kb_listener.daemon = True
-        self.kb_listener.start()
+        # swap in a new table in one assignment; Play/Pause wins on a clash
+        self._key_bindings = {hotkey_code(exit_key): self._on_close,
+                              hotkey_code(start_key): self._toggle_play}
         self._set_status(
             f"Hotkeys applied — {start_key} = Play/Pause | "
             f"Esc = Exit | "
@@ -652,50 +1404,45 @@ class App(tk.Tk):
     def _start_key_capture(self, target_var, btn, allow_mouse=False):
         """Wait for the next keypress (or middle-click when allow_mouse=True)
         and write its name into target_var."""
+        if self._capture is not None:
+            return
         original_text = btn.cget("text")
         btn.config(text="...", state="disabled")
         self._set_status("Press the desired key now…")
 
-        def finish(name):
-            target_var.set(name)
-            self.after(0, lambda: btn.config(text=original_text, state="normal"))
-            self._set_status(f"Key set to: {name}")
-
-        def on_key(key):
-            try:
-                name = key.name          # special key, e.g. 'f8', 'esc'
-            except AttributeError:
-                name = key.char or str(key)   # regular character
-            self.after(0, finish, name)
-            return False                 # stop listener
-
-        kb = KeyboardListener(on_press=on_key)
-        kb.daemon = True
-
-        if allow_mouse:
-            def on_mouse_click(x, y, button, pressed):
-                if pressed and button == Button.middle:
-                    kb.stop()
-                    self.after(0, finish, "middle")
-                    return False
-            mouse_l = MouseListener(on_click=on_mouse_click)
-            mouse_l.daemon = True
-            mouse_l.start()
-            # patch kb stop to also stop mouse listener
-            _orig_stop = kb.stop
-            def _patched_stop():
-                _orig_stop()
-                if mouse_l.is_alive():
-                    mouse_l.stop()
-            kb.stop = _patched_stop
-
-        kb.start()
+        if allow_mouse and self._mouse_listener is None:
+            # started on first use, then kept for later captures
+            self._mouse_listener = MouseListener(
+                on_click=self._on_global_click,
+                win32_event_filter=ignore_motion_filter)
+            self._mouse_listener.daemon = True
+            self._mouse_listener.start()
+        self._capture = (target_var, btn, original_text, allow_mouse)
+
+    def _finish_key_capture(self, name):
+        if self._capture is None:
+            return                       # already handled
+        target_var, btn, original_text, _ = self._capture
+        self._capture = None
+        target_var.set(name)
+        btn.config(text=original_text, state="normal")
+        self._set_status(f"Key set to: {name}")
 
     # =========================================================
     # Misc
     # =========================================================
     def _set_status(self, msg):
-        self.after(0, lambda: self.status_var.set(msg))
+        """Thread-safe status update. Bursts of messages (e.g. rapid
+        Play/Pause from the player thread) share one Tk callback, and only
+        the latest message is shown."""
+        self._status_msg = msg
+        if not self._status_pending:
+            self._status_pending = True
+            self.after(0, self._flush_status)
+
+    def _flush_status(self):
+        self._status_pending = False   # cleared before reading the message
+        self.status_var.set(self._status_msg)
 
     def _toggle_always_on_top(self):
         self.attributes("-topmost", self.on_top_var.get())
@@ -707,6 +1454,10 @@ class App(tk.Tk):
             self.recorder.stop()
         if self.kb_listener:
             self.kb_listener.stop()
+        if self._mouse_listener:
+            self._mouse_listener.stop()
+        if _TIMER_PERIOD_RAISED:
+            ctypes.windll.winmm.timeEndPeriod(1)
         self.destroy()
 
 